@@ -0,0 +1,280 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""中二病也要造汉字 - 组合字编译为字体
+
+读取前端"导出组合 JSON"得到的组合文件，把每个组合的部件路径按画布变换合并成
+一个字形，写入私用区（PUA）码位，生成可安装的 TTF/OTF 字体。
+
+组合文件格式：
+
+    {
+      "canvas": [600, 600],
+      "compositions": [
+        {
+          "name": "白车",
+          "codepoint": "U+E000",          // 可选，缺省时自动分配
+          "components": [
+            {"name": "白2", "matrix": [a, b, c, d, e, f], "pathOffset": [x, y]}
+          ]
+        }
+      ]
+    }
+
+matrix 与 pathOffset 直接取自 fabric.js 对象的 calcTransformMatrix() 与
+pathOffset，画布点 = matrix · (部件点 - pathOffset)。
+"""
+
+import json
+import os
+from pathlib import Path
+
+from fontTools.fontBuilder import FontBuilder
+from fontTools.misc.transform import Transform
+from fontTools.pens.cu2quPen import Cu2QuPen
+from fontTools.pens.recordingPen import RecordingPen
+from fontTools.pens.reverseContourPen import ReverseContourPen
+from fontTools.pens.t2CharStringPen import T2CharStringPen
+from fontTools.pens.transformPen import TransformPen
+from fontTools.pens.ttGlyphPen import TTGlyphPen
+from fontTools.svgLib.path import parse_path
+
+from merge_outlines import union_parts
+from radical_library import RadicalLibrary
+
+
+UNITS_PER_EM = 1000
+ASCENT = 880
+DESCENT = -120
+CANVAS_SIZE = 600
+
+PUA_RANGES = [(0xE000, 0xF8FF), (0xF0000, 0xFFFFD), (0x100000, 0x10FFFD)]
+
+
+def canvas_to_font_transform(canvas_size=CANVAS_SIZE):
+    """画布坐标（y 向下，0~canvas_size）→ 字体坐标（y 向上，DESCENT~ASCENT）"""
+    k = UNITS_PER_EM / canvas_size
+    return Transform(k, 0, 0, -k, 0, ASCENT)
+
+
+def component_transform(component, canvas_size=CANVAS_SIZE):
+    """部件路径坐标 → 字体坐标的完整变换"""
+    offset_x, offset_y = component.get('pathOffset', (0, 0))
+    matrix = Transform(*component['matrix'])
+    return canvas_to_font_transform(canvas_size).transform(matrix).translate(-offset_x, -offset_y)
+
+
+def parse_codepoint(value):
+    if value is None:
+        return None
+    if isinstance(value, int):
+        return value
+    value = value.strip()
+    if value.upper().startswith('U+'):
+        return int(value[2:], 16)
+    return ord(value) if len(value) == 1 else int(value, 0)
+
+
+def iter_pua_codepoints(used):
+    for start, end in PUA_RANGES:
+        for code_point in range(start, end + 1):
+            if code_point not in used:
+                yield code_point
+
+
+def load_compositions(inputs):
+    """读取组合文件或目录，返回 (组合列表, 画布尺寸)"""
+    compositions = []
+    canvas_size = CANVAS_SIZE
+
+    files = []
+    for item in inputs:
+        item = Path(item)
+        files.extend(sorted(item.glob('*.json')) if item.is_dir() else [item])
+
+    for json_file in files:
+        with open(json_file, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if isinstance(data, list):
+            compositions.extend(data)
+        else:
+            compositions.extend(data.get('compositions', []))
+            if data.get('canvas'):
+                canvas_size = data['canvas'][0]
+
+    return compositions, canvas_size
+
+
+class CompositionFontBuilder:
+    def __init__(self, library, canvas_size=CANVAS_SIZE, flavor='ttf', merge=False):
+        self.library = library
+        self.canvas_size = canvas_size
+        self.flavor = flavor
+        self.merge = merge
+        self._recordings = {}
+
+    def _component_recording(self, name):
+        """部件路径只解析一次，之后重放录制结果"""
+        if name not in self._recordings:
+            path_data = self.library.get_path(name)
+            if not path_data:
+                self._recordings[name] = None
+            else:
+                recording = RecordingPen()
+                parse_path(path_data, recording)
+                self._recordings[name] = recording
+        return self._recordings[name]
+
+    def _component_drawers(self, composition):
+        drawers = []
+        missing = []
+        for component in composition.get('components', []):
+            recording = self._component_recording(component.get('name'))
+            if recording is None:
+                missing.append(component.get('name'))
+                continue
+            transform = component_transform(component, self.canvas_size)
+            # 镜像变换会反转轮廓方向，重叠时按非零规则会互相抵消，需要再反转回来
+            mirrored = transform.xx * transform.yy - transform.xy * transform.yx < 0
+            drawers.append(lambda pen, r=recording, t=transform, m=mirrored:
+                           r.replay(TransformPen(ReverseContourPen(pen) if m else pen, t)))
+        return drawers, missing
+
+    def draw_composition(self, composition, pen):
+        """把组合的全部部件画到 pen 上，返回缺失的部件名列表
+
+        merge=True 时先把部件轮廓求并，字形中不再有重叠轮廓。
+        """
+        drawers, missing = self._component_drawers(composition)
+        if self.merge and drawers:
+            union_parts(drawers, clockwise=self.flavor != 'otf').draw(pen)
+        else:
+            for draw in drawers:
+                draw(pen)
+        return missing
+
+    def _build_glyph(self, composition):
+        if self.flavor == 'otf':
+            pen = T2CharStringPen(UNITS_PER_EM, None)
+            missing = self.draw_composition(composition, pen)
+            return pen.getCharString(), missing
+
+        pen = TTGlyphPen(None)
+        missing = self.draw_composition(composition, Cu2QuPen(pen, 1.0, reverse_direction=False))
+        return pen.glyph(), missing
+
+    def build(self, compositions, output_file, family_name='Chunibyo Composed'):
+        """返回 [{"name", "codepoint"}]，组合名可能重复，按组合顺序一一对应"""
+        claimed = {}
+        for i, composition in enumerate(compositions, 1):
+            code_point = parse_codepoint(composition.get('codepoint'))
+            if code_point is not None:
+                claimed.setdefault(code_point, []).append(composition.get('name') or f"组合{i}")
+        clashes = {cp: names for cp, names in claimed.items() if len(names) > 1}
+        if clashes:
+            details = '；'.join(f"U+{cp:04X}：{', '.join(names)}" for cp, names in sorted(clashes.items()))
+            raise ValueError(f"多个组合指定了相同的码位 - {details}")
+        free_codepoints = iter_pua_codepoints(set(claimed))
+
+        glyph_order = ['.notdef']
+        cmap = {}
+        mapping = []
+        if self.flavor == 'otf':
+            glyphs = {'.notdef': T2CharStringPen(UNITS_PER_EM, None).getCharString()}
+        else:
+            glyphs = {'.notdef': TTGlyphPen(None).glyph()}
+
+        for composition in compositions:
+            name = composition.get('name') or f"组合{len(mapping) + 1}"
+            code_point = parse_codepoint(composition.get('codepoint'))
+            if code_point is None:
+                code_point = next(free_codepoints)
+            glyph_name = f"uni{code_point:04X}" if code_point <= 0xFFFF else f"u{code_point:05X}"
+
+            glyph, missing = self._build_glyph(composition)
+            if missing:
+                print(f"⚠ {name} - 缺少部件：{', '.join(str(m) for m in missing)}")
+
+            glyphs[glyph_name] = glyph
+            glyph_order.append(glyph_name)
+            cmap[code_point] = glyph_name
+            mapping.append({'name': name, 'codepoint': f"U+{code_point:04X}"})
+
+        fb = FontBuilder(UNITS_PER_EM, isTTF=self.flavor != 'otf')
+        fb.setupGlyphOrder(glyph_order)
+        fb.setupCharacterMap(cmap)
+
+        ps_name = family_name.replace(' ', '') + '-Regular'
+        if self.flavor == 'otf':
+            fb.setupCFF(ps_name, {'FullName': family_name}, glyphs, {})
+        else:
+            fb.setupGlyf(glyphs)
+
+        metrics = {}
+        for glyph_name in glyph_order:
+            if self.flavor == 'otf':
+                bounds = glyphs[glyph_name].calcBounds(None)
+                lsb = bounds[0] if bounds else 0
+            else:
+                lsb = getattr(glyphs[glyph_name], 'xMin', 0)
+            metrics[glyph_name] = (UNITS_PER_EM, int(lsb))
+
+        fb.setupHorizontalMetrics(metrics)
+        fb.setupHorizontalHeader(ascent=ASCENT, descent=DESCENT)
+        fb.setupNameTable({'familyName': family_name, 'styleName': 'Regular'})
+        fb.setupOS2(sTypoAscender=ASCENT, sTypoDescender=DESCENT, usWinAscent=ASCENT,
+                    usWinDescent=-DESCENT)
+        fb.setupPost()
+        fb.save(output_file)
+
+        return mapping
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description='🔤 中二病也要造汉字 - 组合字编译为字体',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+示例用法：
+  # 把前端导出的组合编译成 TTF
+  python build_font.py compositions.json --output chunibyo.ttf
+
+  # 合并目录下所有组合文件，生成 OTF
+  python build_font.py compositions/ --output chunibyo.otf --format otf
+        """
+    )
+    parser.add_argument('inputs', nargs='+', help='组合 JSON 文件或目录')
+    parser.add_argument('--json', default='radicals.json', help='部件库 JSON 文件路径')
+    parser.add_argument('--output', default='chunibyo.ttf', help='输出字体路径')
+    parser.add_argument('--format', choices=['ttf', 'otf'], help='字体格式（默认按输出扩展名）')
+    parser.add_argument('--family', default='Chunibyo Composed', help='字体族名')
+    parser.add_argument('--merge', action='store_true',
+                        help='合并重叠的部件轮廓（需要 skia-pathops）')
+
+    args = parser.parse_args()
+
+    flavor = args.format or ('otf' if args.output.lower().endswith('.otf') else 'ttf')
+    compositions, canvas_size = load_compositions(args.inputs)
+    if not compositions:
+        print("❌ 未找到任何组合")
+        return
+
+    library = RadicalLibrary(args.json)
+    builder = CompositionFontBuilder(library, canvas_size, flavor, args.merge)
+    try:
+        mapping = builder.build(compositions, args.output, args.family)
+    except ValueError as e:
+        print(f"❌ {e}")
+        return
+
+    map_file = os.path.splitext(args.output)[0] + '.map.json'
+    with open(map_file, 'w', encoding='utf-8') as f:
+        json.dump(mapping, f, ensure_ascii=False, indent=2)
+
+    print(f"✅ 已编译 {len(mapping)} 个组合字 → {args.output}")
+    print(f"📋 码位映射：{map_file}")
+
+
+if __name__ == "__main__":
+    main()
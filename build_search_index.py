@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""中二病也要造汉字 - 部件库搜索索引
+
+为前端生成倒排索引 radicals_index.json：
+
+    {
+      "version": 1,
+      "entries": [["白2", "泊_right", "U+767D"], ...],
+      "index": {"白": [0, 3], "泊": [3], "u+767d": [0], ...}
+    }
+
+词项来自部件名中的每个字、source 中的来源字、unicode 码位，以及 IDS 拆分
+得到的全部构件（部件自带的 ids 字段，或 --ids 指定的 cjkvi-ids 格式数据）。
+前端按词项求交集，即可查询"所有包含'白'的部件"。
+"""
+
+import json
+import re
+from pathlib import Path
+
+from radical_library import RadicalLibrary
+
+
+# 表意文字描述字符（U+2FF0–U+2FFF 与 U+31EF），只表示结构，不作为词项
+IDS_OPERATORS = frozenset(chr(c) for c in range(0x2FF0, 0x3000)) | {'\u31ef'}
+
+IDS_NOISE_RE = re.compile(r'&[^;]+;|\[[^\]]*\]|\^|\$\([^)]*\)')
+
+
+def load_ids_table(ids_file):
+    """读取 cjkvi-ids 格式（码位<TAB>字<TAB>IDS...），返回 {字: IDS}"""
+    table = {}
+    with open(ids_file, 'r', encoding='utf-8') as f:
+        for line in f:
+            if not line.strip() or line.startswith(('#', ';')):
+                continue
+            fields = line.rstrip('\n').split('\t')
+            if len(fields) < 3:
+                continue
+            ids = IDS_NOISE_RE.sub('', fields[2])
+            if ids and ids != fields[1]:
+                table[fields[1]] = ids
+    return table
+
+
+def ids_members(char, ids_table, _seen=None):
+    """递归展开 IDS，返回构成该字的全部构件（含中间层）"""
+    _seen = _seen if _seen is not None else set()
+    members = set()
+    for part in ids_table.get(char, ''):
+        if part in IDS_OPERATORS or part in _seen or part == char:
+            continue
+        _seen.add(part)
+        members.add(part)
+        members |= ids_members(part, ids_table, _seen)
+    return members
+
+
+def _is_term_char(char):
+    return not char.isascii() and not char.isspace() and char not in IDS_OPERATORS
+
+
+def entry_terms(name, entry, ids_table):
+    terms = {name.lower()}
+    chars = {c for c in name if _is_term_char(c)}
+
+    source = entry.get('source', '')
+    if source:
+        chars |= {c for c in source.split('_')[0] if _is_term_char(c)}
+    ref = entry.get('ref') or {}
+    if ref.get('char'):
+        chars.add(ref['char'])
+
+    for part in entry.get('ids', ''):
+        if _is_term_char(part):
+            chars.add(part)
+
+    if ids_table:
+        for char in list(chars):
+            chars |= ids_members(char, ids_table)
+
+    terms |= chars
+    terms |= {f"u+{ord(c):04x}" for c in chars}
+    if entry.get('unicode'):
+        terms.add(entry['unicode'].lower())
+    return terms
+
+
+def build_search_index(library, ids_table=None):
+    entries = []
+    index = {}
+    for i, name in enumerate(library.names()):
+        entry = library.entry(name)
+        entries.append([name, entry.get('source', ''), entry.get('unicode', '')])
+        for term in entry_terms(name, entry, ids_table or {}):
+            index.setdefault(term, []).append(i)
+    return {'version': 1, 'entries': entries, 'index': index}
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='🔤 中二病也要造汉字 - 生成部件库搜索索引')
+    parser.add_argument('--json', default='radicals.json', help='部件库 JSON 文件路径')
+    parser.add_argument('--ids', help='cjkvi-ids 格式的 IDS 数据文件（可选）')
+    parser.add_argument('--output', default='radicals_index.json', help='输出文件路径')
+
+    args = parser.parse_args()
+
+    ids_table = load_ids_table(args.ids) if args.ids else None
+    if ids_table:
+        print(f"✓ 已加载 IDS 数据：{len(ids_table)} 个字")
+
+    library = RadicalLibrary(args.json)
+    data = build_search_index(library, ids_table)
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, separators=(',', ':'))
+
+    print(f"✅ 已索引 {len(data['entries'])} 个部件，{len(data['index'])} 个词项 → {args.output}")
+    print(f"📁 文件：{Path(args.output).absolute()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,318 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""中二病也要造汉字 - IDS 自动拼字
+
+根据表意文字描述序列（IDS，如 ⿰扌白、⿱⺩车）把部件库中的部件按结构
+放入各自的格子，生成整字路径或可由 build_font.py 编译的组合文件。
+
+部件路径只解析一次，坐标保存为 NumPy 数组；同一批表达式中同一部件的
+所有仿射变换会合并成一次批量矩阵运算。
+"""
+
+import json
+import time
+from pathlib import Path
+
+import numpy as np
+from fontTools.misc.transform import Transform
+from fontTools.pens.recordingPen import RecordingPen
+from fontTools.pens.svgPathPen import SVGPathPen
+from fontTools.svgLib.path import parse_path
+
+from build_font import ASCENT, DESCENT, UNITS_PER_EM, canvas_to_font_transform
+from export_svg import DEFAULT_OPTIONS, render_svg
+from merge_outlines import union_parts
+from radical_library import RadicalLibrary, format_number
+
+
+# 各结构符对子格子的划分：(x0, y0, x1, y1)，以父格子为单位正方形，y 向上
+LAYOUTS = {
+    '⿰': [(0.0, 0.0, 0.45, 1.0), (0.45, 0.0, 1.0, 1.0)],
+    '⿱': [(0.0, 0.55, 1.0, 1.0), (0.0, 0.0, 1.0, 0.55)],
+    '⿲': [(0.0, 0.0, 0.33, 1.0), (0.33, 0.0, 0.67, 1.0), (0.67, 0.0, 1.0, 1.0)],
+    '⿳': [(0.0, 0.67, 1.0, 1.0), (0.0, 0.33, 1.0, 0.67), (0.0, 0.0, 1.0, 0.33)],
+    '⿴': [(0.0, 0.0, 1.0, 1.0), (0.25, 0.25, 0.75, 0.75)],
+    '⿵': [(0.0, 0.0, 1.0, 1.0), (0.25, 0.0, 0.75, 0.7)],
+    '⿶': [(0.0, 0.0, 1.0, 1.0), (0.25, 0.3, 0.75, 1.0)],
+    '⿷': [(0.0, 0.0, 1.0, 1.0), (0.3, 0.2, 1.0, 0.8)],
+    '⿸': [(0.0, 0.0, 1.0, 1.0), (0.3, 0.0, 1.0, 0.7)],
+    '⿹': [(0.0, 0.0, 1.0, 1.0), (0.0, 0.0, 0.7, 0.7)],
+    '⿺': [(0.0, 0.0, 1.0, 1.0), (0.3, 0.3, 1.0, 1.0)],
+    '⿻': [(0.0, 0.0, 1.0, 1.0), (0.0, 0.0, 1.0, 1.0)],
+}
+
+PADDING = 40
+EM_CELL = (PADDING, DESCENT + PADDING, UNITS_PER_EM - PADDING, ASCENT - PADDING)
+
+_POINT_COUNTS = {'moveTo': 1, 'lineTo': 1, 'qCurveTo': 2, 'curveTo': 3}
+_SVG_COMMANDS = {'moveTo': 'M', 'lineTo': 'L', 'qCurveTo': 'Q', 'curveTo': 'C'}
+
+
+class ComponentGeometry:
+    """部件路径的数组形式：命令模板 + (K, 2) 坐标数组"""
+
+    def __init__(self, path_data, y_down=False):
+        recording = RecordingPen()
+        parse_path(path_data, recording)
+
+        parts = []
+        points = []
+        self.ops = []
+        for op, args in recording.value:
+            if op in ('closePath', 'endPath'):
+                parts.append('Z')
+                self.ops.append((op, 0))
+                continue
+            parts.append(_SVG_COMMANDS[op] + ' '.join(['{} {}'] * _POINT_COUNTS[op]))
+            points.extend(args)
+            self.ops.append((op, _POINT_COUNTS[op]))
+
+        self.template = ''.join(parts)
+        self.coords = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        if y_down:
+            # 手动切割得到的 SVG 坐标部件（scaleY > 0）先翻转为字体坐标方向
+            self.coords[:, 1] = -self.coords[:, 1]
+
+        if len(self.coords):
+            self.bounds = tuple(float(v) for v in (*self.coords.min(axis=0), *self.coords.max(axis=0)))
+        else:
+            self.bounds = None
+
+    def format(self, coords):
+        return self.template.format(*np.rint(coords).astype(np.int64).ravel().tolist())
+
+    def draw(self, pen, coords):
+        """用变换后的坐标直接重放到 pen，省去再解析字符串"""
+        points = [tuple(pt) for pt in np.rint(coords).tolist()]
+        i = 0
+        for op, count in self.ops:
+            getattr(pen, op)(*points[i:i + count])
+            i += count
+
+
+def tokenize(expression, names):
+    """结构符单独成词，其余按部件库名称最长匹配（如'白2'优先于'白'）"""
+    longest = max((len(n) for n in names), default=1)
+    tokens = []
+    i = 0
+    while i < len(expression):
+        char = expression[i]
+        if char.isspace():
+            i += 1
+            continue
+        if char in LAYOUTS:
+            tokens.append(char)
+            i += 1
+            continue
+        for length in range(min(longest, len(expression) - i), 0, -1):
+            candidate = expression[i:i + length]
+            if candidate in names:
+                tokens.append(candidate)
+                i += length
+                break
+        else:
+            raise ValueError(f"部件库中没有部件：{char}")
+    return tokens
+
+
+def parse_ids(expression, names):
+    """解析为嵌套元组：(结构符, 子节点...) 或部件名"""
+    tokens = tokenize(expression, names)
+    position = 0
+
+    def parse_node():
+        nonlocal position
+        if position >= len(tokens):
+            raise ValueError(f"IDS 不完整：{expression}")
+        token = tokens[position]
+        position += 1
+        if token in LAYOUTS:
+            return (token, *[parse_node() for _ in LAYOUTS[token]])
+        return token
+
+    tree = parse_node()
+    if position != len(tokens):
+        raise ValueError(f"IDS 多余部分：{''.join(tokens[position:])}")
+    return tree
+
+
+def layout_leaves(tree, cell=EM_CELL):
+    """产出 (部件名, 格子)"""
+    if isinstance(tree, str):
+        yield tree, cell
+        return
+
+    x0, y0, x1, y1 = cell
+    width, height = x1 - x0, y1 - y0
+    for child, (u0, v0, u1, v1) in zip(tree[1:], LAYOUTS[tree[0]]):
+        child_cell = (x0 + u0 * width, y0 + v0 * height, x0 + u1 * width, y0 + v1 * height)
+        yield from layout_leaves(child, child_cell)
+
+
+class IDSComposer:
+    def __init__(self, library, keep_aspect=False):
+        self.library = library
+        self.keep_aspect = keep_aspect
+        self.names = set(library.names())
+        self._geometry = {}
+
+    def geometry(self, name):
+        if name not in self._geometry:
+            path_data = self.library.get_path(name)
+            if not path_data:
+                raise ValueError(f"部件没有路径数据：{name}")
+            entry = self.library.entry(name)
+            self._geometry[name] = ComponentGeometry(path_data, y_down=(entry.get('scaleY') or -1) > 0)
+        return self._geometry[name]
+
+    def _component_bounds(self, name):
+        # 只用由坐标算出的边界框：库中旧部件的 bounds 字段把 H/V 参数当成了坐标对，并不可靠
+        return self.geometry(name).bounds
+
+    def fit(self, name, cell):
+        """部件边界框 → 格子的仿射变换 (a, b, c, d, e, f)"""
+        xMin, yMin, xMax, yMax = self._component_bounds(name)
+        cx0, cy0, cx1, cy1 = cell
+        sx = (cx1 - cx0) / max(xMax - xMin, 1)
+        sy = (cy1 - cy0) / max(yMax - yMin, 1)
+        if self.keep_aspect:
+            sx = sy = min(sx, sy)
+        dx = (cx0 + cx1) / 2 - sx * (xMin + xMax) / 2
+        dy = (cy0 + cy1) / 2 - sy * (yMin + yMax) / 2
+        return (sx, 0.0, 0.0, sy, dx, dy)
+
+    def placements(self, expression):
+        tree = parse_ids(expression, self.names)
+        return [(name, self.fit(name, cell)) for name, cell in layout_leaves(tree)]
+
+    def compose_many(self, expressions, merge=False):
+        """批量生成整字路径（字体坐标），失败的表达式返回 None
+
+        同一部件在所有表达式中的变换堆叠成 (T, 6) 数组，一次 einsum
+        算出全部坐标。merge=True 时再把各部件轮廓求并为无重叠轮廓。
+        """
+        placements = []
+        for expression in expressions:
+            try:
+                placements.append(self.placements(expression))
+            except ValueError as e:
+                print(f"⚠ {expression} - {e}")
+                placements.append(None)
+
+        jobs = {}
+        for i, items in enumerate(placements):
+            for j, (name, matrix) in enumerate(items or []):
+                jobs.setdefault(name, []).append((i, j, matrix))
+
+        pieces = [[None] * len(items) if items else None for items in placements]
+        for name, entries in jobs.items():
+            geometry = self.geometry(name)
+            m = np.array([matrix for _, _, matrix in entries], dtype=np.float64)
+            # (a, b, c, d) 重排为 [[a, b], [c, d]]，即 x' = x·a + y·c, y' = x·b + y·d
+            coords = np.einsum('kj,tji->tki', geometry.coords, m[:, :4].reshape(-1, 2, 2)) + m[:, None, 4:]
+            for (i, j, _), transformed in zip(entries, coords):
+                if merge:
+                    pieces[i][j] = lambda pen, g=geometry, c=transformed: g.draw(pen, c)
+                else:
+                    pieces[i][j] = geometry.format(transformed)
+
+        if merge:
+            return [self._merge(p) if p is not None else None for p in pieces]
+        return [''.join(p) if p is not None else None for p in pieces]
+
+    @staticmethod
+    def _merge(drawers):
+        svg_pen = SVGPathPen(None, ntos=format_number)
+        union_parts(drawers).draw(svg_pen)
+        return svg_pen.getCommands()
+
+    def compose(self, expression, merge=False):
+        return self.compose_many([expression], merge)[0]
+
+    def to_composition(self, expression, canvas_size=600):
+        """生成与前端"保存当前组合"相同格式的组合"""
+        to_canvas = canvas_to_font_transform(canvas_size).inverse()
+        components = []
+        for name, matrix in self.placements(expression):
+            fit = Transform(*matrix)
+            if (self.library.entry(name).get('scaleY') or -1) > 0:
+                fit = fit.scale(1, -1)
+            components.append({
+                'name': name,
+                'matrix': [round(v, 6) for v in to_canvas.transform(fit)],
+                'pathOffset': [0, 0]
+            })
+        return {'name': expression, 'components': components}
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description='🔤 中二病也要造汉字 - IDS 自动拼字',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+示例用法：
+  # 打印整字路径
+  python compose_ids.py ⿰扌白 ⿱⺩车
+
+  # 每个表达式输出一个 SVG
+  python compose_ids.py ⿰扌白2 ⿰冫车2 --svg output_ids
+
+  # 从文件读取表达式（每行一个），生成可编译为字体的组合文件
+  python compose_ids.py --file ids.txt --composition compositions.json
+        """
+    )
+    parser.add_argument('expressions', nargs='*', help='IDS 表达式')
+    parser.add_argument('--file', help='表达式文件，每行一个')
+    parser.add_argument('--json', default='radicals.json', help='部件库 JSON 文件路径')
+    parser.add_argument('--svg', help='SVG 输出目录')
+    parser.add_argument('--composition', help='组合 JSON 输出路径（可交给 build_font.py）')
+    parser.add_argument('--keep-aspect', action='store_true', help='部件等比缩放')
+    parser.add_argument('--merge', action='store_true',
+                        help='合并重叠的部件轮廓（需要 skia-pathops）')
+
+    args = parser.parse_args()
+
+    expressions = list(args.expressions)
+    if args.file:
+        with open(args.file, 'r', encoding='utf-8') as f:
+            expressions.extend(line.strip() for line in f if line.strip())
+    if not expressions:
+        parser.print_help()
+        return
+
+    composer = IDSComposer(RadicalLibrary(args.json), keep_aspect=args.keep_aspect)
+
+    start = time.perf_counter()
+    paths = composer.compose_many(expressions, args.merge)
+    elapsed = time.perf_counter() - start
+    success = [(e, p) for e, p in zip(expressions, paths) if p]
+
+    if args.svg:
+        output_dir = Path(args.svg)
+        output_dir.mkdir(parents=True, exist_ok=True)
+        for expression, path_data in success:
+            with open(output_dir / f'{expression}.svg', 'w', encoding='utf-8') as f:
+                f.write(render_svg(path_data, DEFAULT_OPTIONS))
+        print(f"📁 SVG 输出目录：{output_dir.absolute()}")
+
+    if args.composition:
+        data = {
+            'canvas': [600, 600],
+            'compositions': [composer.to_composition(e) for e, _ in success]
+        }
+        with open(args.composition, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+        print(f"📋 组合文件：{args.composition}")
+
+    if not args.svg and not args.composition:
+        for expression, path_data in success:
+            print(f"{expression}\t{path_data}")
+
+    rate = len(success) / elapsed if elapsed else float('inf')
+    print(f"✅ 生成 {len(success)}/{len(expressions)} 个字，用时 {elapsed:.3f}s（{rate:.0f} 个/秒）")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""中二病也要造汉字 - SVG 转 PNG/PDF
+
+用 svglib + reportlab 把 export_svg.py 导出的字 SVG 以及部件库中的部件
+批量转换为多种 DPI 的 PNG 与单页 PDF，转换在进程池中并行执行。
+
+输出目录中的 manifest.json 记录每个源 SVG 的哈希，源内容未变化且输出
+文件齐全时直接跳过。--sheet 模式把整个部件库排版成多页 PDF 总览表。
+
+PNG 输出依赖 reportlab 的 renderPM 后端 rlPyCairo（已列入 requirements.txt，
+其依赖 pycairo 需要系统中装有 cairo）；后端仍不可用时只输出 PDF。
+"""
+
+import hashlib
+import io
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from reportlab.graphics import renderPDF, renderPM
+from reportlab.graphics.shapes import Drawing
+from reportlab.lib.pagesizes import A4
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.cidfonts import UnicodeCIDFont
+from reportlab.pdfgen import canvas as pdf_canvas
+from svglib.svglib import svg2rlg
+
+from export_svg import DEFAULT_OPTIONS, load_manifest, render_svg, save_manifest
+from radical_library import RadicalLibrary
+
+
+DEFAULT_DPIS = (72, 150, 300)
+SHEET_COLUMNS = 6
+SHEET_ROWS = 8
+SHEET_MARGIN = 36
+SHEET_LABEL_FONT = 'STSong-Light'
+
+
+def component_svg(library, name):
+    """部件库中的部件渲染为与 export_svg.py 相同格式的 SVG 文本"""
+    path_data = library.get_path(name)
+    if not path_data:
+        return None
+    entry = library.entry(name)
+    options = dict(DEFAULT_OPTIONS)
+    if (entry.get('scaleY') or -1) > 0:
+        # 手动切割的部件本身就是 SVG 坐标，无需再翻转
+        options['transform'] = 'matrix(1,0,0,1,0,0)'
+    return render_svg(path_data, options)
+
+
+def collect_sources(svg_dir=None, library=None):
+    """返回 [(输出名, SVG 字节)]，字 SVG 优先按 manifest 取各字的最新文件"""
+    sources = []
+
+    if svg_dir and Path(svg_dir).is_dir():
+        svg_dir = Path(svg_dir)
+        manifest = load_manifest(svg_dir)
+        if manifest:
+            files = [svg_dir / entry['file'] for entry in manifest.values()]
+        else:
+            files = sorted(svg_dir.glob('*.svg'))
+        for svg_file in files:
+            if svg_file.exists():
+                sources.append((svg_file.stem, svg_file.read_bytes()))
+
+    if library is not None:
+        for name in library.names():
+            svg_text = component_svg(library, name)
+            if svg_text:
+                sources.append((f'component_{name}', svg_text.encode('utf-8')))
+            else:
+                print(f"⚠ 部件 {name} 没有路径数据，跳过")
+
+    return sources
+
+
+def png_backend_error():
+    """renderPM 后端不可用时返回错误信息，可用时返回 None"""
+    try:
+        renderPM.drawToString(Drawing(1, 1), fmt='PNG')
+    except Exception as e:
+        return str(e).splitlines()[0]
+    return None
+
+
+def _convert_one(job):
+    name, svg_bytes, output_dir, dpis, pdf = job
+    output_dir = Path(output_dir)
+    outputs = []
+    try:
+        drawing = svg2rlg(io.BytesIO(svg_bytes))
+    except Exception as e:
+        return name, outputs, str(e)
+    if drawing is None:
+        return name, outputs, "SVG 解析失败"
+
+    # PDF 与 PNG 分开渲染，一种格式失败不影响另一种
+    errors = []
+    if pdf:
+        try:
+            pdf_file = output_dir / 'pdf' / f'{name}.pdf'
+            pdf_file.parent.mkdir(parents=True, exist_ok=True)
+            renderPDF.drawToFile(drawing, str(pdf_file))
+            outputs.append(str(pdf_file.relative_to(output_dir)))
+        except Exception as e:
+            errors.append(f"PDF：{e}")
+
+    try:
+        for dpi in dpis:
+            png_file = output_dir / 'png' / str(dpi) / f'{name}.png'
+            png_file.parent.mkdir(parents=True, exist_ok=True)
+            renderPM.drawToFile(drawing, str(png_file), fmt='PNG', dpi=dpi)
+            outputs.append(str(png_file.relative_to(output_dir)))
+    except Exception as e:
+        errors.append(f"PNG：{e}")
+
+    return name, outputs, '；'.join(errors) or None
+
+
+def convert_sources(sources, output_dir='output_converted', dpis=DEFAULT_DPIS, pdf=True, jobs=None):
+    """并行转换，源 SVG 哈希与输出参数未变化的条目直接跳过"""
+    if dpis:
+        backend_error = png_backend_error()
+        if backend_error:
+            print(f"⚠ renderPM 后端不可用，跳过 PNG 输出：{backend_error}")
+            print("💡 PNG 输出需要 renderPM 后端：pip install -r requirements.txt（pycairo 需要系统中装有 cairo）")
+            dpis = ()
+    if not dpis and not pdf:
+        print("❌ 没有可输出的格式")
+        return []
+
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    manifest = load_manifest(output_dir)
+    options = {'dpis': sorted(dpis), 'pdf': pdf}
+
+    pending = []
+    skipped = 0
+    hashes = {}
+    for name, svg_bytes in sources:
+        digest = hashlib.sha256(svg_bytes).hexdigest()
+        hashes[name] = digest
+        entry = manifest.get(name)
+        if (entry and entry.get('hash') == digest and entry.get('options') == options
+                and all((output_dir / f).exists() for f in entry.get('outputs', []))):
+            skipped += 1
+            continue
+        pending.append((name, svg_bytes, str(output_dir), tuple(dpis), pdf))
+
+    print(f"\n开始转换 {len(pending)} 个 SVG（跳过未变化的 {skipped} 个）")
+    print("-" * 60)
+
+    failures = []
+    if pending:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            for name, outputs, error in executor.map(_convert_one, pending, chunksize=4):
+                if error:
+                    failures.append({'name': name, 'error': error})
+                    print(f"❌ {name}：{error}")
+                    continue
+                manifest[name] = {'hash': hashes[name], 'options': options, 'outputs': outputs}
+                print(f"✓ {name} → {len(outputs)} 个文件")
+
+        save_manifest(output_dir, manifest)
+
+    print("-" * 60)
+    print(f"✓ 转换完成：{len(pending) - len(failures)}/{len(pending)}，输出目录：{output_dir.absolute()}")
+    return failures
+
+
+def build_contact_sheet(sources, output_file, columns=SHEET_COLUMNS, rows=SHEET_ROWS):
+    """把全部 SVG 排版到多页 A4 PDF，每格下方标注名称"""
+    page_width, page_height = A4
+    cell_width = (page_width - 2 * SHEET_MARGIN) / columns
+    cell_height = (page_height - 2 * SHEET_MARGIN) / rows
+    label_height = 12
+    per_page = columns * rows
+
+    pdfmetrics.registerFont(UnicodeCIDFont(SHEET_LABEL_FONT))
+    sheet = pdf_canvas.Canvas(str(output_file), pagesize=A4)
+    sheet.setTitle('中二病也要造汉字 - 部件总览')
+    drawn = 0
+
+    for name, svg_bytes in sources:
+        drawing = svg2rlg(io.BytesIO(svg_bytes))
+        if drawing is None:
+            print(f"⚠ {name} - SVG 解析失败，跳过")
+            continue
+
+        if drawn and drawn % per_page == 0:
+            sheet.showPage()
+        slot = drawn % per_page
+        col, row = slot % columns, slot // columns
+        x = SHEET_MARGIN + col * cell_width
+        y = page_height - SHEET_MARGIN - (row + 1) * cell_height
+
+        scale = min(cell_width / drawing.width, (cell_height - label_height) / drawing.height) * 0.9
+        sheet.saveState()
+        sheet.translate(x + (cell_width - drawing.width * scale) / 2, y + label_height)
+        sheet.scale(scale, scale)
+        renderPDF.draw(drawing, sheet, 0, 0)
+        sheet.restoreState()
+
+        sheet.setFont(SHEET_LABEL_FONT, 7)
+        sheet.drawCentredString(x + cell_width / 2, y + 2, name)
+        sheet.rect(x, y, cell_width, cell_height, stroke=1, fill=0)
+        drawn += 1
+
+    sheet.save()
+    pages = (drawn + per_page - 1) // per_page
+    print(f"✓ 总览表：{drawn} 个，共 {pages} 页 → {output_file}")
+    return drawn
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description='🔤 中二病也要造汉字 - SVG 转 PNG/PDF',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+示例用法：
+  # 转换 output_svg 中的字和部件库中的全部部件
+  python convert_svg.py
+
+  # 只转换导出的字，输出 150/600 DPI 的 PNG，4 个进程
+  python convert_svg.py --no-library --dpi 150 600 --jobs 4
+
+  # 生成部件库多页 PDF 总览表
+  python convert_svg.py --no-svg --sheet library_sheet.pdf
+        """
+    )
+    parser.add_argument('--svg-dir', default='output_svg', help='字 SVG 目录（默认：output_svg）')
+    parser.add_argument('--json', default='radicals.json', help='部件库 JSON 文件路径')
+    parser.add_argument('--no-svg', action='store_true', help='不转换字 SVG')
+    parser.add_argument('--no-library', action='store_true', help='不转换部件库')
+    parser.add_argument('--output', default='output_converted', help='输出目录（默认：output_converted）')
+    parser.add_argument('--dpi', type=int, nargs='+', default=list(DEFAULT_DPIS), help='PNG 分辨率列表')
+    parser.add_argument('--no-png', action='store_true', help='不输出 PNG')
+    parser.add_argument('--no-pdf', action='store_true', help='不输出单页 PDF')
+    parser.add_argument('--jobs', type=int, default=None, help='并行进程数（默认：CPU 核数）')
+    parser.add_argument('--sheet', help='生成多页 PDF 总览表到该路径（不再逐个转换）')
+
+    args = parser.parse_args()
+
+    library = None if args.no_library else RadicalLibrary(args.json)
+    sources = collect_sources(None if args.no_svg else args.svg_dir, library)
+    if not sources:
+        print("❌ 没有可转换的 SVG")
+        return
+
+    if args.sheet:
+        build_contact_sheet(sources, args.sheet)
+    else:
+        dpis = [] if args.no_png else args.dpi
+        convert_sources(sources, args.output, dpis, not args.no_pdf, args.jobs)
+
+
+if __name__ == "__main__":
+    main()
@@ -47,6 +47,34 @@ class FontPathExtractor:
             print(f"⚠ 提取失败 {glyph_name}: {e}")
             return None
 
+    def iter_radicals(self, char_list, verbose=True):
+        """逐个产出 (字符, 条目)，未找到或路径为空的字符条目为 None"""
+        for char in char_list:
+            glyph_name = self.unicode_to_glyph_name(char)
+            if not glyph_name:
+                if verbose:
+                    print(f"⚠ {char} - 未找到字形")
+                yield char, None
+                continue
+
+            path_data = self.get_svg_path(glyph_name)
+            if not path_data:
+                if verbose:
+                    print(f"⚠ {char} - 路径为空")
+                yield char, None
+                continue
+
+            if verbose:
+                print(f"✓ {char} ({glyph_name})")
+            yield char, {
+                'glyph_name': glyph_name,
+                'path': path_data,
+                'unicode': f"U+{ord(char):04X}"
+            }
+
+    def all_chars(self):
+        return [chr(code_point) for code_point in sorted(self.cmap)]
+
     def extract_radicals(self, char_list, output_json='radicals.json'):
         result = {}
         success_count = 0
@@ -54,22 +82,10 @@ class FontPathExtractor:
         print(f"\n开始提取 {len(char_list)} 个字符...")
         print("-" * 60)
 
-        for char in char_list:
-            glyph_name = self.unicode_to_glyph_name(char)
-            if glyph_name:
-                path_data = self.get_svg_path(glyph_name)
-                if path_data:
-                    result[char] = {
-                        'glyph_name': glyph_name,
-                        'path': path_data,
-                        'unicode': f"U+{ord(char):04X}"
-                    }
-                    success_count += 1
-                    print(f"✓ {char} ({glyph_name})")
-                else:
-                    print(f"⚠ {char} - 路径为空")
-            else:
-                print(f"⚠ {char} - 未找到字形")
+        for char, entry in self.iter_radicals(char_list):
+            if entry:
+                result[char] = entry
+                success_count += 1
 
         print("-" * 60)
         print(f"✓ 成功提取：{success_count}/{len(char_list)}")
@@ -81,18 +97,120 @@ class FontPathExtractor:
         print(f"✓ 已保存至：{output_path}")
         return result
 
+    @staticmethod
+    def _last_committed_char(output_file):
+        """返回 NDJSON 文件最后一条完整记录的字符，并截掉末尾写了一半的行"""
+        if not os.path.exists(output_file):
+            return None
+
+        with open(output_file, 'rb+') as f:
+            size = f.seek(0, os.SEEK_END)
+            tail = b''
+            pos = size
+            while pos > 0:
+                step = min(65536, pos)
+                pos -= step
+                f.seek(pos)
+                tail = f.read(step) + tail
+                if tail.count(b'\n') >= 2 or pos == 0:
+                    break
+
+            end = tail.rfind(b'\n')
+            if end == -1:
+                f.truncate(0)
+                return None
+
+            if end != len(tail) - 1:
+                f.truncate(pos + end + 1)
+
+            last_line = tail[:end].rsplit(b'\n', 1)[-1]
+            try:
+                return json.loads(last_line.decode('utf-8'))['char']
+            except (ValueError, KeyError):
+                return None
+
+    def extract_radicals_stream(self, char_list, output_file, fmt='ndjson',
+                                resume=True, progress_every=1000):
+        """流式写出路径数据，内存占用与字符数量无关
+
+        fmt='ndjson' 时每行一条记录，逐条 flush，中断后可从最后一条完整记录续跑；
+        fmt='json' 时流式写出与 extract_radicals 相同结构的 JSON 对象（不支持续跑）。
+        """
+        char_list = list(char_list)
+        start = 0
+        mode = 'w'
+
+        if fmt == 'ndjson' and resume:
+            last_char = self._last_committed_char(output_file)
+            if last_char is not None and last_char in char_list:
+                start = char_list.index(last_char) + 1
+                mode = 'a'
+                print(f"✓ 从 {last_char} (U+{ord(last_char):04X}) 之后继续，跳过 {start} 个字符")
+            elif os.path.exists(output_file) and os.path.getsize(output_file):
+                # 已有文件不是本次字符列表中断留下的，不能续跑，也不能悄悄覆盖
+                raise FileExistsError(
+                    f"{output_file} 已存在且无法从中续跑当前字符列表，"
+                    f"请换一个 --output 或加 --no-resume 重新写出")
+
+        pending = char_list[start:]
+        print(f"\n开始流式提取 {len(pending)} 个字符 → {output_file}")
+        print("-" * 60)
+
+        success_count = 0
+        with open(output_file, mode, encoding='utf-8') as f:
+            if fmt == 'json':
+                f.write('{')
+
+            for index, (char, entry) in enumerate(self.iter_radicals(pending, verbose=False), 1):
+                if entry:
+                    if fmt == 'json':
+                        f.write(',\n' if success_count else '\n')
+                        f.write(f"  {json.dumps(char, ensure_ascii=False)}: ")
+                        f.write(json.dumps(entry, ensure_ascii=False))
+                    else:
+                        f.write(json.dumps({'char': char, **entry}, ensure_ascii=False))
+                        f.write('\n')
+                        f.flush()
+                    success_count += 1
+
+                if index % progress_every == 0:
+                    print(f"  … {index}/{len(pending)}（当前 {char}）")
+
+            if fmt == 'json':
+                f.write('\n}\n')
+
+        print("-" * 60)
+        print(f"✓ 成功提取：{success_count}/{len(pending)}")
+        print(f"✓ 已保存至：{os.path.abspath(output_file)}")
+        return success_count
+
 
 if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description='🔤 思源宋体路径提取工具')
+    parser.add_argument('chars', nargs='?', help="要提取的汉字（如'白泊车'）")
+    parser.add_argument('--all', action='store_true', help='提取字体中的全部字符')
+    parser.add_argument('--output', help='输出文件路径')
+    parser.add_argument('--stream', choices=['ndjson', 'json'],
+                        help='流式写出（ndjson 支持中断续跑）')
+    parser.add_argument('--no-resume', action='store_true', help='ndjson 模式下不续跑，重新写出')
+    parser.add_argument('--font', help='字体文件路径')
+
+    args = parser.parse_args()
+
     radicals_and_chars = [
         '白', '泊', '车'
     ]
 
     current_dir = os.path.dirname(os.path.abspath(__file__))
 
-    font_path = os.path.join(current_dir, 'fonts', 'NotoSerifSC-VariableFont_wght.ttf')
-
-    if not os.path.exists(font_path):
-        font_path = os.path.join(current_dir, 'NotoSerifSC-VariableFont_wght.ttf')
+    if args.font:
+        font_path = args.font
+    else:
+        font_path = os.path.join(current_dir, 'fonts', 'NotoSerifSC-VariableFont_wght.ttf')
+        if not os.path.exists(font_path):
+            font_path = os.path.join(current_dir, 'NotoSerifSC-VariableFont_wght.ttf')
 
     print("=" * 60)
     print("🔤 思源宋体路径提取工具")
@@ -102,4 +220,19 @@ if __name__ == "__main__":
 
     extractor = FontPathExtractor(font_path)
 
-    result = extractor.extract_radicals(radicals_and_chars, 'radicals.json')
+    if args.all:
+        char_list = extractor.all_chars()
+    elif args.chars:
+        char_list = list(args.chars)
+    else:
+        char_list = radicals_and_chars
+
+    if args.stream:
+        output_file = args.output or f'font_paths.{args.stream}'
+        try:
+            extractor.extract_radicals_stream(char_list, output_file, args.stream,
+                                              resume=not args.no_resume)
+        except FileExistsError as e:
+            print(f"❌ {e}")
+    else:
+        result = extractor.extract_radicals(char_list, args.output or 'radicals.json')
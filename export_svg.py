@@ -5,46 +5,120 @@
 from fontTools.ttLib import TTFont
 from fontTools.pens.svgPathPen import SVGPathPen
 from pathlib import Path
-from datetime import datetime
+import hashlib
+import json
+import os
 
+from file_digest import file_digest
 
-def export_char_svg(font_path, char, output_dir='output_svg'):
 
-    font = TTFont(font_path)
-    glyphSet = font.getGlyphSet()
-    cmap = font.getBestCmap()
+MANIFEST_NAME = 'manifest.json'
 
-    glyph_name = cmap.get(ord(char))
-    if not glyph_name or glyph_name not in glyphSet:
-        print(f"❌ 未找到字符：{char}")
-        font.close()
-        return None
+DEFAULT_OPTIONS = {
+    'width': 500,
+    'height': 500,
+    'viewBox': '0 -200 1000 1400',
+    'fill': '#000',
+    'transform': 'matrix(1,0,0,-1,0,1000)'
+}
 
-    glyph = glyphSet[glyph_name]
 
-    pen = SVGPathPen(glyphSet)
-    glyph.draw(pen)
-    path_data = pen.getCommands()
+def export_key(digest, glyph_name, options):
+    payload = json.dumps([digest, glyph_name, options], sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
 
-    font.close()
 
-    svg_content = f'''<?xml version="1.0" encoding="UTF-8"?>
-<svg xmlns="http://www.w3.org/2000/svg" width="500" height="500" viewBox="0 -200 1000 1400">
-    <path d="{path_data}" fill="#000" transform="matrix(1,0,0,-1,0,1000)"/>
+def render_svg(path_data, options):
+    return f'''<?xml version="1.0" encoding="UTF-8"?>
+<svg xmlns="http://www.w3.org/2000/svg" width="{options['width']}" height="{options['height']}" viewBox="{options['viewBox']}">
+    <path d="{path_data}" fill="{options['fill']}" transform="{options['transform']}"/>
 </svg>'''
 
+
+def load_manifest(output_dir):
+    manifest_file = Path(output_dir) / MANIFEST_NAME
+    if not manifest_file.exists():
+        return {}
+    try:
+        with open(manifest_file, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except json.JSONDecodeError:
+        print(f"⚠️ {manifest_file} 损坏，将重新生成")
+        return {}
+
+
+def save_manifest(output_dir, manifest):
+    manifest_file = Path(output_dir) / MANIFEST_NAME
+    tmp_file = manifest_file.with_suffix('.json.tmp')
+    with open(tmp_file, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_file, manifest_file)
+
+
+def export_chars_svg(font_path, chars, output_dir='output_svg', options=None):
+    """批量导出 SVG，文件名由 字体哈希 + 字形 + 导出参数 决定
+
+    manifest.json 记录每个字符当前对应的文件，内容未变化的字符直接跳过，
+    不会重复绘制或写入。
+    """
+    options = {**DEFAULT_OPTIONS, **(options or {})}
     output_dir = Path(output_dir)
     output_dir.mkdir(exist_ok=True)
 
-    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-    output_file = output_dir / f'{char}_{timestamp}.svg'
+    digest = file_digest(font_path)
+    manifest = load_manifest(output_dir)
+
+    font = TTFont(font_path)
+    glyphSet = font.getGlyphSet()
+    cmap = font.getBestCmap()
+
+    output_files = []
+    changed = False
 
-    with open(output_file, 'w', encoding='utf-8') as f:
-        f.write(svg_content)
+    for char in chars:
+        glyph_name = cmap.get(ord(char))
+        if not glyph_name or glyph_name not in glyphSet:
+            print(f"❌ 未找到字符：{char}")
+            output_files.append(None)
+            continue
+
+        key = export_key(digest, glyph_name, options)
+        output_file = output_dir / f'{char}_{key[:16]}.svg'
+
+        entry = manifest.get(char)
+        if entry and entry.get('key') == key and output_file.exists():
+            print(f"= {char} 未变化 → {output_file.name}")
+            output_files.append(output_file)
+            continue
 
-    print(f"✓ {char} → {output_file.name}")
+        if not output_file.exists():
+            pen = SVGPathPen(glyphSet)
+            glyphSet[glyph_name].draw(pen)
+            with open(output_file, 'w', encoding='utf-8') as f:
+                f.write(render_svg(pen.getCommands(), options))
+            print(f"✓ {char} → {output_file.name}")
+        else:
+            print(f"= {char} 已存在 → {output_file.name}")
+
+        manifest[char] = {
+            'file': output_file.name,
+            'key': key,
+            'glyph_name': glyph_name,
+            'font': os.path.basename(font_path)
+        }
+        changed = True
+        output_files.append(output_file)
 
-    return output_file
+    font.close()
+
+    if changed:
+        save_manifest(output_dir, manifest)
+
+    return output_files
+
+
+def export_char_svg(font_path, char, output_dir='output_svg'):
+    return export_chars_svg(font_path, [char], output_dir)[0]
 
 
 def interactive_mode():
@@ -75,8 +149,7 @@ def interactive_mode():
             continue
 
         char_list = char.replace(',', ' ').replace(',', ' ').split()
-        for c in char_list:
-            export_char_svg(font_path, c, output_dir)
+        export_chars_svg(font_path, char_list, output_dir)
 
     print(f"\n📁 输出目录：{Path(output_dir).absolute()}")
 
@@ -5,22 +5,41 @@
 from fontTools.ttLib import TTFont
 from fontTools.pens.svgPathPen import SVGPathPen
 from fontTools.pens.boundsPen import ControlBoundsPen
+from concurrent.futures import ProcessPoolExecutor
 import json
 import os
 import re
 from pathlib import Path
 
+from glyph_metrics_index import GlyphMetricsIndex
+
 
 class SingleRadicalExtractor:
-    def __init__(self, font_path):
+    def __init__(self, font_path, verbose=True, index_dir=None):
         if not os.path.exists(font_path):
             raise FileNotFoundError(f"字体文件不存在：{font_path}")
 
         self.font_path = font_path
+        self.verbose = verbose
         self.font = TTFont(font_path)
         self.glyphSet = self.font.getGlyphSet()
         self.cmap = self.font.getBestCmap()
-        print(f"✓ 字体加载成功：{os.path.basename(font_path)}")
+        self._log(f"✓ 字体加载成功：{os.path.basename(font_path)}")
+
+        self.index_dir = index_dir
+        self.metrics = GlyphMetricsIndex.open(index_dir)
+        mismatch = self.metrics.check_font(font_path) if self.metrics else None
+        if mismatch:
+            self._log(f"⚠️ 度量索引与字体不匹配，已忽略：{mismatch}（请重新运行 glyph_metrics_index.py build）")
+            self.metrics = None
+        elif self.metrics:
+            self._log(f"✓ 度量索引已加载：{len(self.metrics)} 个字符")
+        elif index_dir:
+            self._log(f"⚠️ 度量索引不存在：{index_dir}")
+
+    def _log(self, message):
+        if self.verbose:
+            print(message)
 
     def get_char_path(self, char):
         glyph_name = self.cmap.get(ord(char))
@@ -164,8 +183,8 @@ class SingleRadicalExtractor:
 
         return path_data.strip()
 
-    def generate_component_json(self, component_name, component_path, bounds,
-                                source_char, cut_x, side, output_file='radicals_new.json'):
+    def build_component_data(self, component_name, component_path, bounds,
+                             source_char, cut_x, side):
         cleaned_path = self._clean_path_string(component_path)
 
         if cleaned_path:
@@ -178,12 +197,12 @@ class SingleRadicalExtractor:
                 ]
             else:
                 actual_bounds = list(bounds)
-                print(f"⚠️ 坐标解析失败，使用原边界框")
+                self._log(f"⚠️ 坐标解析失败，使用原边界框")
         else:
             cleaned_path = component_path
             actual_bounds = list(bounds)
 
-        component_data = {
+        return {
             component_name: {
                 "source": f"{source_char}_{side}",
                 "cut_x": round(cut_x, 1),
@@ -193,6 +212,7 @@ class SingleRadicalExtractor:
             }
         }
 
+    def write_components(self, component_data, output_file='radicals_new.json'):
         if os.path.exists(output_file):
             try:
                 with open(output_file, 'r', encoding='utf-8') as f:
@@ -208,26 +228,33 @@ class SingleRadicalExtractor:
             json.dump(output_data, f, ensure_ascii=False, indent=2)
 
         print(f"✓ 部件数据已保存至：{output_file}")
+
+    def generate_component_json(self, component_name, component_path, bounds,
+                                source_char, cut_x, side, output_file='radicals_new.json'):
+        component_data = self.build_component_data(
+            component_name, component_path, bounds, source_char, cut_x, side
+        )
+        self.write_components(component_data, output_file)
         return component_data
 
-    def extract(self, source_char, side='left', split_x=None,
-                component_name=None, output_file='radicals_new.json'):
-        """单字提取核心方法"""
-        print(f"\n🔍 开始提取：'{source_char}' ({side}侧)")
+    def extract_component(self, source_char, side='left', split_x=None, component_name=None):
+        """提取部件但不写文件，返回 (结果摘要, 部件数据)；失败时抛出 ValueError"""
+        self._log(f"\n🔍 开始提取：'{source_char}' ({side}侧)")
 
-        char_info = self.get_char_path(source_char)
+        char_info = self.get_char_path(source_char) if source_char else None
         if not char_info:
-            print(f"❌ 字体中未找到字符：{source_char}")
-            return None
+            raise ValueError(f"字体中未找到字符：{source_char}")
 
         bounds = char_info['bounds']
-        print(f"✓ '{source_char}' 边界框：{bounds}")
-        print(f"  X 范围：{bounds[0]:.0f} ~ {bounds[2]:.0f}")
+        self._log(f"✓ '{source_char}' 边界框：{bounds}")
+        self._log(f"  X 范围：{bounds[0]:.0f} ~ {bounds[2]:.0f}")
 
+        if split_x is None and self.metrics:
+            split_x = self.metrics.suggest_split(source_char, side)
         if split_x is None:
             width = bounds[2] - bounds[0]
             split_x = bounds[0] + width * (0.4 if side == 'left' else 0.35)
-        print(f"✓ 分割线位置：X = {split_x:.0f}")
+        self._log(f"✓ 分割线位置：X = {split_x:.0f}")
 
         if side == 'left':
             component_path = self.extract_left_component(char_info['path'], bounds, split_x)
@@ -235,22 +262,20 @@ class SingleRadicalExtractor:
             component_path = self.extract_right_component(char_info['path'], bounds, split_x)
 
         if not component_path:
-            print("❌ 路径提取失败，请调整分割线位置")
-            return None
+            raise ValueError("路径提取失败，请调整分割线位置")
 
-        print(f"✓ 路径提取成功，长度：{len(component_path)} 字符")
+        self._log(f"✓ 路径提取成功，长度：{len(component_path)} 字符")
 
         if component_name is None:
             component_name = f"{source_char}_{side}"
 
-        self.generate_component_json(
+        component_data = self.build_component_data(
             component_name=component_name,
             component_path=component_path,
             bounds=bounds,
             source_char=source_char,
             cut_x=split_x,
-            side=side,
-            output_file=output_file
+            side=side
         )
 
         return {
@@ -259,7 +284,21 @@ class SingleRadicalExtractor:
             'side': side,
             'cut_x': split_x,
             'path_length': len(component_path)
-        }
+        }, component_data
+
+    def extract(self, source_char, side='left', split_x=None,
+                component_name=None, output_file='radicals_new.json'):
+        """单字提取核心方法"""
+        try:
+            result, component_data = self.extract_component(
+                source_char, side, split_x, component_name
+            )
+        except ValueError as e:
+            print(f"❌ {e}")
+            return None
+
+        self.write_components(component_data, output_file)
+        return result
 
     def interactive_mode(self, output_file='radicals_new.json'):
         print("\n" + "=" * 60)
@@ -277,12 +316,19 @@ class SingleRadicalExtractor:
         if side not in ['left', 'right']:
             side = 'left'
 
-        char_info = self.get_char_path(source_char)
-        if char_info:
-            bounds = char_info['bounds']
-            width = bounds[2] - bounds[0]
-            suggested_split = bounds[0] + width * (0.4 if side == 'left' else 0.35)
-            print(f"\n💡 建议分割线位置：X ≈ {suggested_split:.0f}")
+        info = self.metrics.lookup(source_char) if self.metrics else None
+        if info and info['bounds']:
+            bounds = info['bounds']
+            print(f"\n✓ '{source_char}' 边界框：{tuple(round(v) for v in bounds)}，轮廓 {info['contours']} 个")
+            suggested_split = self.metrics.suggest_split(source_char, side)
+            print(f"💡 建议分割线位置（墨迹最少处）：X ≈ {suggested_split:.0f}")
+        else:
+            char_info = self.get_char_path(source_char)
+            if char_info:
+                bounds = char_info['bounds']
+                width = bounds[2] - bounds[0]
+                suggested_split = bounds[0] + width * (0.4 if side == 'left' else 0.35)
+                print(f"\n💡 建议分割线位置：X ≈ {suggested_split:.0f}")
 
         split_x_input = input("请输入分割线 X 坐标（直接回车使用建议值）：").strip()
         split_x = float(split_x_input) if split_x_input else None
@@ -316,24 +362,52 @@ class SingleRadicalExtractor:
             print(f"   3. 复制精修后的路径替换 radicals.json 中的 path")
             print("=" * 60)
 
-    def batch_mode(self, config_list, output_file='radicals_new.json'):
+    def batch_mode(self, config_list, output_file='radicals_new.json', jobs=1, report_file=None):
+        """批量提取，结果按配置顺序合并后只写一次文件
+
+        jobs > 1 时每个进程持有独立的字体句柄并行提取；失败项汇总到报告中，
+        不会中断整个批处理。
+        """
         print("\n" + "=" * 60)
         print("🔤 中二病也要造汉字 - 批量部件提取")
         print("=" * 60)
 
+        tasks = list(enumerate(config_list))
+        if jobs > 1:
+            print(f"✓ 并行进程数：{jobs}")
+            with ProcessPoolExecutor(max_workers=jobs, initializer=_init_batch_worker,
+                                     initargs=(self.font_path, self.index_dir)) as executor:
+                outcomes = list(executor.map(_run_batch_task, tasks,
+                                             chunksize=max(1, len(tasks) // (jobs * 4))))
+        else:
+            outcomes = [_run_batch_task(task, self) for task in tasks]
+
         results = []
-        for config in config_list:
-            result = self.extract(
-                source_char=config.get('char'),
-                side=config.get('side', 'left'),
-                split_x=config.get('split_x'),
-                component_name=config.get('name'),
-                output_file=output_file
-            )
-            if result:
-                results.append(result)
+        failures = []
+        merged = {}
+        for index, result, component_data, error in outcomes:
+            config = config_list[index]
+            if error:
+                failures.append({'index': index, 'char': config.get('char'),
+                                 'name': config.get('name'), 'error': error})
+                print(f"❌ #{index} {config.get('char')}：{error}")
+                continue
+            merged.update(component_data)
+            results.append(result)
+            print(f"✓ #{index} {result['source_char']} → {result['component_name']}")
+
+        if merged:
+            self.write_components(merged, output_file)
+
+        if report_file:
+            with open(report_file, 'w', encoding='utf-8') as f:
+                json.dump({'succeeded': len(results), 'failed': failures}, f,
+                          ensure_ascii=False, indent=2)
+            print(f"📋 失败报告：{report_file}")
 
         print(f"\n✅ 批量提取完成！共处理 {len(results)}/{len(config_list)} 个部件")
+        if failures:
+            print(f"⚠️ {len(failures)} 个部件提取失败")
         return results
 
     def close(self):
@@ -341,6 +415,33 @@ class SingleRadicalExtractor:
             self.font.close()
 
 
+_batch_extractor = None
+
+
+def _init_batch_worker(font_path, index_dir=None):
+    global _batch_extractor
+    _batch_extractor = SingleRadicalExtractor(font_path, verbose=False, index_dir=index_dir)
+
+
+def _run_batch_task(task, extractor=None):
+    index, config = task
+    extractor = extractor or _batch_extractor
+    verbose = extractor.verbose
+    extractor.verbose = False
+    try:
+        result, component_data = extractor.extract_component(
+            source_char=config.get('char'),
+            side=config.get('side', 'left'),
+            split_x=config.get('split_x'),
+            component_name=config.get('name')
+        )
+        return index, result, component_data, None
+    except Exception as e:
+        return index, None, None, str(e)
+    finally:
+        extractor.verbose = verbose
+
+
 def main():
     import argparse
 
@@ -357,6 +458,9 @@ def main():
 
   # 指定输出文件
   python extract_radical.py 泊 --side right --name 白_右部件 --output radicals_bai.json
+
+  # 4 进程并行批量提取，失败项写入报告
+  python extract_radical.py --batch batch.json --jobs 4 --report batch_report.json
         """
     )
 
@@ -368,8 +472,12 @@ def main():
     parser.add_argument('--output', type=str, default='radicals.json',
                         help='输出文件路径（默认：radicals.json）')
     parser.add_argument('--batch', type=str, help='批量提取配置文件路径')
+    parser.add_argument('--jobs', type=int, default=1, help='批量提取的并行进程数（默认：1）')
+    parser.add_argument('--report', type=str, help='批量提取失败报告输出路径')
     parser.add_argument('--font', type=str, default='fonts/NotoSerifSC-VariableFont_wght.ttf',
                         help='字体文件路径')
+    parser.add_argument('--index', type=str,
+                        help='glyph_metrics_index.py 生成的度量索引目录，用于快速给出边界框与分割建议')
 
     args = parser.parse_args()
 
@@ -377,13 +485,13 @@ def main():
     font_path = current_dir / args.font if not os.path.isabs(args.font) else args.font
 
     try:
-        extractor = SingleRadicalExtractor(str(font_path))
+        extractor = SingleRadicalExtractor(str(font_path), index_dir=args.index)
 
         if args.batch:
             batch_path = current_dir / args.batch if not os.path.isabs(args.batch) else args.batch
             with open(batch_path, 'r', encoding='utf-8') as f:
                 config_list = json.load(f)
-            extractor.batch_mode(config_list, args.output)
+            extractor.batch_mode(config_list, args.output, args.jobs, args.report)
         elif args.char:
             extractor.extract(
                 source_char=args.char,
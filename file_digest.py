@@ -0,0 +1,26 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""中二病也要造汉字 - 文件哈希
+
+export_svg.py 的内容寻址导出与 glyph_metrics_index.py 的索引校验都要用
+字体文件的 sha256，同一文件在进程内只读一次。
+"""
+
+from functools import lru_cache
+import hashlib
+import os
+
+
+@lru_cache(maxsize=None)
+def _file_digest(file_path, size, mtime):
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def file_digest(file_path):
+    """文件的 sha256，按 (路径, 大小, 修改时间) 缓存"""
+    stat = os.stat(file_path)
+    return _file_digest(str(file_path), stat.st_size, stat.st_mtime_ns)
@@ -0,0 +1,368 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""中二病也要造汉字 - 字形度量索引
+
+一次性遍历整套字体，把每个字形的边界框、轮廓数、点数、步进宽度以及
+按 X 方向分列的墨迹分布保存为 .npy 数组，之后以内存映射方式加载，
+无需重新绘制字形即可查询。
+
+索引目录结构：
+
+    codepoints.npy   uint32 (N,)        已排序的码位
+    bounds.npy       float32 (N, 4)     xMin, yMin, xMax, yMax（无轮廓时为 NaN）
+    contours.npy     int32 (N,)         轮廓数
+    points.npy       int32 (N,)         点数（含离线控制点）
+    advance.npy      int32 (N,)         步进宽度
+    ink.npy          float32 (N, C)     每列中心线上被墨迹覆盖的竖直长度
+    meta.json        字体文件名、大小、sha256 与列参数
+"""
+
+import json
+import os
+from pathlib import Path
+
+import numpy as np
+from fontTools.pens.basePen import BasePen
+from fontTools.ttLib import TTFont
+
+from file_digest import file_digest
+
+
+INK_COLUMNS = 100
+INK_RANGE = (0, 1000)
+CURVE_STEPS = 8
+
+
+class PolygonPen(BasePen):
+    """把轮廓展平成折线，同时统计轮廓数与点数"""
+
+    def __init__(self, glyphSet, curve_steps=CURVE_STEPS):
+        super().__init__(glyphSet)
+        self.curve_steps = curve_steps
+        self.contours = []
+        self.point_count = 0
+        self._current = None
+        self._start = None
+        self._last_op = None
+
+    def moveTo(self, pt):
+        self.point_count += 1
+        self._start = pt
+        self._last_op = 'moveTo'
+        super().moveTo(pt)
+
+    def lineTo(self, pt):
+        self.point_count += 1
+        self._last_op = 'lineTo'
+        super().lineTo(pt)
+
+    def curveTo(self, *points):
+        self.point_count += len(points)
+        self._last_op = 'curveTo'
+        super().curveTo(*points)
+
+    def qCurveTo(self, *points):
+        self.point_count += len([pt for pt in points if pt is not None])
+        self._last_op = 'qCurveTo'
+        super().qCurveTo(*points)
+
+    def _moveTo(self, pt):
+        self._current = [pt]
+        self.contours.append(self._current)
+
+    def _lineTo(self, pt):
+        self._current.append(pt)
+
+    def _curveToOne(self, pt1, pt2, pt3):
+        (x0, y0) = self._getCurrentPoint()
+        t = np.linspace(0, 1, self.curve_steps + 1)[1:]
+        mt = 1 - t
+        xs = mt ** 3 * x0 + 3 * mt ** 2 * t * pt1[0] + 3 * mt * t ** 2 * pt2[0] + t ** 3 * pt3[0]
+        ys = mt ** 3 * y0 + 3 * mt ** 2 * t * pt1[1] + 3 * mt * t ** 2 * pt2[1] + t ** 3 * pt3[1]
+        self._current.extend(zip(xs.tolist(), ys.tolist()))
+
+    def _qCurveToOne(self, pt1, pt2):
+        (x0, y0) = self._getCurrentPoint()
+        t = np.linspace(0, 1, self.curve_steps + 1)[1:]
+        mt = 1 - t
+        xs = mt ** 2 * x0 + 2 * mt * t * pt1[0] + t ** 2 * pt2[0]
+        ys = mt ** 2 * y0 + 2 * mt * t * pt1[1] + t ** 2 * pt2[1]
+        self._current.extend(zip(xs.tolist(), ys.tolist()))
+
+    def _closePath(self):
+        # 以曲线结尾的闭合轮廓会把起点作为最后一个在线点再画一次，不重复计数
+        # 以 lineTo 回到起点的轮廓，起点在字形数据中确实存了两次，照常计数
+        if (self._last_op in ('curveTo', 'qCurveTo') and self._start is not None
+                and self._getCurrentPoint() == self._start):
+            self.point_count -= 1
+        self._current = None
+        self._start = None
+        self._last_op = None
+
+    def _endPath(self):
+        self._current = None
+        self._start = None
+        self._last_op = None
+
+
+def ink_profile(contours, column_x):
+    """按非零环绕规则计算每条竖直扫描线上的墨迹长度"""
+    edges = []
+    for contour in contours:
+        if len(contour) < 2:
+            continue
+        pts = np.asarray(contour, dtype=np.float64)
+        edges.append(np.concatenate([pts, np.roll(pts, -1, axis=0)], axis=1))
+    if not edges:
+        return np.zeros(len(column_x), dtype=np.float32)
+
+    x0, y0, x1, y1 = (v[:, None] for v in np.concatenate(edges).T)
+    x = np.asarray(column_x)[None, :]
+
+    # 每条边与每条扫描线的交点，(边数, 列数)，未相交处为 inf 以便排序到末尾
+    hit = ((x0 <= x) & (x < x1)) | ((x1 <= x) & (x < x0))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ys = np.where(hit, y0 + (x - x0) / (x1 - x0) * (y1 - y0), np.inf)
+    winding = np.where(hit, np.where(x1 > x0, 1, -1), 0)
+
+    order = np.argsort(ys, axis=0)
+    ys = np.take_along_axis(ys, order, axis=0)
+    running = np.cumsum(np.take_along_axis(winding, order, axis=0), axis=0)
+
+    with np.errstate(invalid='ignore'):
+        segment = ys[1:] - ys[:-1]
+    inside = (running[:-1] != 0) & np.isfinite(segment)
+    return np.where(inside, segment, 0).sum(axis=0).astype(np.float32)
+
+
+def build_index(font_path, index_dir, columns=INK_COLUMNS, ink_range=INK_RANGE,
+                progress_every=2000):
+    """遍历字体 cmap，生成度量索引"""
+    font = TTFont(font_path)
+    glyphSet = font.getGlyphSet()
+    cmap = font.getBestCmap()
+    hmtx = font['hmtx']
+
+    codepoints = np.array(sorted(cmap), dtype=np.uint32)
+    count = len(codepoints)
+    step = (ink_range[1] - ink_range[0]) / columns
+    column_x = ink_range[0] + step * (np.arange(columns) + 0.5)
+
+    bounds = np.full((count, 4), np.nan, dtype=np.float32)
+    contours = np.zeros(count, dtype=np.int32)
+    points = np.zeros(count, dtype=np.int32)
+    advance = np.zeros(count, dtype=np.int32)
+    ink = np.zeros((count, columns), dtype=np.float32)
+
+    print(f"\n开始建立索引：{count} 个字符，{columns} 列墨迹分布")
+    print("-" * 60)
+
+    for i, code_point in enumerate(codepoints.tolist()):
+        glyph_name = cmap[code_point]
+        pen = PolygonPen(glyphSet)
+        try:
+            glyphSet[glyph_name].draw(pen)
+        except Exception as e:
+            print(f"⚠ 绘制失败 U+{code_point:04X} {glyph_name}: {e}")
+            continue
+
+        advance[i] = hmtx[glyph_name][0]
+        contours[i] = len(pen.contours)
+        points[i] = pen.point_count
+        if pen.contours:
+            all_points = np.concatenate([np.asarray(c) for c in pen.contours])
+            bounds[i] = [*all_points.min(axis=0), *all_points.max(axis=0)]
+            ink[i] = ink_profile(pen.contours, column_x)
+
+        if (i + 1) % progress_every == 0:
+            print(f"  … {i + 1}/{count}")
+
+    font.close()
+
+    index_dir = Path(index_dir)
+    index_dir.mkdir(parents=True, exist_ok=True)
+    for name, array in (('codepoints', codepoints), ('bounds', bounds), ('contours', contours),
+                        ('points', points), ('advance', advance), ('ink', ink)):
+        np.save(index_dir / f'{name}.npy', array)
+
+    meta = {
+        'font': os.path.basename(font_path),
+        'font_size': os.path.getsize(font_path),
+        'font_sha256': file_digest(font_path),
+        'count': count,
+        'columns': columns,
+        'ink_range': list(ink_range)
+    }
+    with open(index_dir / 'meta.json', 'w', encoding='utf-8') as f:
+        json.dump(meta, f, ensure_ascii=False, indent=2)
+
+    print("-" * 60)
+    print(f"✓ 索引已保存至：{index_dir.absolute()}")
+    return GlyphMetricsIndex(index_dir)
+
+
+class GlyphMetricsIndex:
+    def __init__(self, index_dir):
+        index_dir = Path(index_dir)
+        with open(index_dir / 'meta.json', 'r', encoding='utf-8') as f:
+            self.meta = json.load(f)
+
+        self.codepoints = np.load(index_dir / 'codepoints.npy', mmap_mode='r')
+        self.bounds = np.load(index_dir / 'bounds.npy', mmap_mode='r')
+        self.contours = np.load(index_dir / 'contours.npy', mmap_mode='r')
+        self.points = np.load(index_dir / 'points.npy', mmap_mode='r')
+        self.advance = np.load(index_dir / 'advance.npy', mmap_mode='r')
+        self.ink = np.load(index_dir / 'ink.npy', mmap_mode='r')
+
+        start, end = self.meta['ink_range']
+        self.column_width = (end - start) / self.meta['columns']
+        self.column_x = start + self.column_width * (np.arange(self.meta['columns']) + 0.5)
+
+    @classmethod
+    def open(cls, index_dir):
+        """索引不存在时返回 None"""
+        if index_dir and (Path(index_dir) / 'meta.json').exists():
+            return cls(index_dir)
+        return None
+
+    def __len__(self):
+        return len(self.codepoints)
+
+    def check_font(self, font_path):
+        """索引与字体文件不一致时返回原因，一致时返回 None"""
+        font = os.path.basename(font_path)
+        if self.meta.get('font') != font:
+            return f"索引建立自 {self.meta.get('font')}，当前字体为 {font}"
+        digest = self.meta.get('font_sha256')
+        if (self.meta.get('font_size') != os.path.getsize(font_path)
+                or (digest and digest != file_digest(font_path))):
+            return f"{font} 与建立索引时的版本不同"
+        return None
+
+    def _row(self, char):
+        code_point = ord(char)
+        row = int(np.searchsorted(self.codepoints, code_point))
+        if row < len(self.codepoints) and self.codepoints[row] == code_point:
+            return row
+        return None
+
+    def lookup(self, char):
+        row = self._row(char)
+        if row is None:
+            return None
+        bounds = self.bounds[row]
+        return {
+            'char': char,
+            'unicode': f"U+{ord(char):04X}",
+            'bounds': None if np.isnan(bounds[0]) else tuple(float(v) for v in bounds),
+            'contours': int(self.contours[row]),
+            'points': int(self.points[row]),
+            'advance': int(self.advance[row]),
+            'ink': np.asarray(self.ink[row])
+        }
+
+    def suggest_split(self, char, side='left', search=0.15):
+        """在默认分割位置附近寻找墨迹最少的列，作为建议分割线"""
+        info = self.lookup(char)
+        if not info or not info['bounds']:
+            return None
+
+        xMin, _, xMax, _ = info['bounds']
+        width = xMax - xMin
+        default = xMin + width * (0.4 if side == 'left' else 0.35)
+        window = (self.column_x >= default - width * search) & (self.column_x <= default + width * search)
+        if not window.any():
+            return default
+
+        candidates = np.flatnonzero(window)
+        ink = info['ink'][candidates]
+        best = candidates[ink == ink.min()]
+        return float(self.column_x[best[np.argmin(np.abs(self.column_x[best] - default))]])
+
+    def find_gaps(self, x, tolerance=20, max_ink=0.0):
+        """返回在 x ± tolerance 范围内存在空白列（墨迹 <= max_ink）的字符
+
+        只统计落在字形自身边界框内的列，字形两侧的留白不算作缝隙。
+        """
+        columns = np.flatnonzero(np.abs(self.column_x - x) <= max(tolerance, self.column_width / 2))
+        if not len(columns):
+            return []
+
+        column_x = self.column_x[columns]
+        inside = (self.bounds[:, 0:1] < column_x) & (column_x < self.bounds[:, 2:3])
+        empty = np.asarray(self.ink[:, columns]) <= max_ink
+        rows = np.flatnonzero((inside & empty).any(axis=1))
+        return [chr(int(c)) for c in self.codepoints[rows]]
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description='🔤 中二病也要造汉字 - 字形度量索引',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+示例用法：
+  # 为整套字体建立索引
+  python glyph_metrics_index.py build --index glyph_index
+
+  # 查询单字度量
+  python glyph_metrics_index.py info 持 --index glyph_index
+
+  # 查找在 X≈400 附近有竖直缝隙的字
+  python glyph_metrics_index.py gaps 400 --tolerance 20 --index glyph_index
+        """
+    )
+    parser.add_argument('--index', default='glyph_index', help='索引目录（默认：glyph_index）')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    build_parser = subparsers.add_parser('build', help='建立索引')
+    build_parser.add_argument('--font', default='fonts/NotoSerifSC-VariableFont_wght.ttf',
+                              help='字体文件路径')
+    build_parser.add_argument('--columns', type=int, default=INK_COLUMNS, help='墨迹分布列数')
+
+    info_parser = subparsers.add_parser('info', help='查询字符度量')
+    info_parser.add_argument('chars', help='要查询的汉字')
+
+    gaps_parser = subparsers.add_parser('gaps', help='查找指定 X 附近有空白列的字符')
+    gaps_parser.add_argument('x', type=float, help='X 坐标')
+    gaps_parser.add_argument('--tolerance', type=float, default=20, help='X 容差（默认：20）')
+    gaps_parser.add_argument('--max-ink', type=float, default=0.0, help='视为空白的最大墨迹长度')
+    gaps_parser.add_argument('--limit', type=int, default=200, help='最多显示的字符数')
+
+    args = parser.parse_args()
+
+    if args.command == 'build':
+        current_dir = Path(__file__).parent
+        font_path = current_dir / args.font if not os.path.isabs(args.font) else args.font
+        if not os.path.exists(font_path):
+            print(f"❌ 字体文件不存在：{font_path}")
+            return
+        build_index(str(font_path), args.index, args.columns)
+        return
+
+    index = GlyphMetricsIndex.open(args.index)
+    if index is None:
+        print(f"❌ 索引不存在：{args.index}，请先运行 build")
+        return
+
+    if args.command == 'info':
+        for char in args.chars:
+            info = index.lookup(char)
+            if not info:
+                print(f"⚠ {char} - 索引中未找到")
+                continue
+            print(f"{char} {info['unicode']}  边界框：{info['bounds']}  轮廓：{info['contours']}"
+                  f"  点数：{info['points']}  步进：{info['advance']}")
+            for side in ('left', 'right'):
+                split_x = index.suggest_split(char, side)
+                if split_x is not None:
+                    print(f"  建议分割线（{side}）：X ≈ {split_x:.0f}")
+    else:
+        chars = index.find_gaps(args.x, args.tolerance, args.max_ink)
+        print(f"✓ X≈{args.x:.0f} 附近有空白列的字符：{len(chars)} 个")
+        print(''.join(chars[:args.limit]))
+
+
+if __name__ == "__main__":
+    main()
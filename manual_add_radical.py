@@ -3,10 +3,30 @@
 """中二病也要造汉字 - 部件手动添加工具"""
 
 import json
+import math
 import re
 import os
+import xml.etree.ElementTree as ET
+from collections import Counter
 from pathlib import Path
 
+from fontTools.misc.transform import Identity, Transform
+from fontTools.pens.svgPathPen import SVGPathPen
+from fontTools.pens.transformPen import TransformPen
+from fontTools.svgLib.path import parse_path
+
+from radical_library import format_number
+
+
+SVG_NS = '{http://www.w3.org/2000/svg}'
+INKSCAPE_LABEL = '{http://www.inkscape.org/namespaces/inkscape}label'
+
+# export_svg.py 导出的 SVG 用该矩阵把字体坐标（y 向上）翻转到 SVG 坐标（y 向下），
+# 导入时再乘一次即可还原为字体坐标，部件无需再设置 scaleY
+FONT_FLIP = Transform(1, 0, 0, -1, 0, 1000)
+
+TRANSFORM_RE = re.compile(r'(matrix|translate|scale|rotate|skewX|skewY)\s*\(([^)]*)\)')
+
 
 def format_path(path_input):
     if not path_input:
@@ -21,6 +41,146 @@ def format_path(path_input):
     return fixed
 
 
+def parse_transform(transform_str):
+    """解析 SVG transform 属性，返回 fontTools Transform"""
+    t = Identity
+    if not transform_str:
+        return t
+
+    for name, args_str in TRANSFORM_RE.findall(transform_str):
+        args = [float(x) for x in re.split(r'[\s,]+', args_str.strip()) if x]
+        if name == 'matrix' and len(args) == 6:
+            t = t.transform(args)
+        elif name == 'translate' and args:
+            t = t.translate(args[0], args[1] if len(args) > 1 else 0)
+        elif name == 'scale' and args:
+            t = t.scale(args[0], args[1] if len(args) > 1 else args[0])
+        elif name == 'rotate' and args:
+            if len(args) == 3:
+                cx, cy = args[1], args[2]
+                t = t.translate(cx, cy).rotate(math.radians(args[0])).translate(-cx, -cy)
+            else:
+                t = t.rotate(math.radians(args[0]))
+        elif name == 'skewX' and args:
+            t = t.skew(math.radians(args[0]), 0)
+        elif name == 'skewY' and args:
+            t = t.skew(0, math.radians(args[0]))
+
+    return t
+
+
+def transform_path(path_data, transform):
+    """把 transform 烘焙进路径坐标，输出绝对坐标的 d 字符串"""
+    pen = SVGPathPen(None, ntos=format_number)
+    parse_path(path_data, TransformPen(pen, transform))
+    return pen.getCommands()
+
+
+def iter_svg_paths(svg_file):
+    """用 iterparse 流式读取 SVG，逐个产出 (名称, 字体坐标路径)
+
+    祖先 <g> 与 <path> 自身的 transform 会累乘进坐标，最后再用 FONT_FLIP
+    还原 y 轴方向。<defs> 中的路径只是定义，不会被导出。
+    """
+    stack = [Identity]
+    defs_depth = 0
+
+    for event, elem in ET.iterparse(svg_file, events=('start', 'end')):
+        tag = elem.tag
+        if event == 'start':
+            stack.append(stack[-1].transform(parse_transform(elem.get('transform'))))
+            if tag == f'{SVG_NS}defs':
+                defs_depth += 1
+            continue
+
+        ctm = stack.pop()
+        if tag == f'{SVG_NS}defs':
+            defs_depth -= 1
+        elif tag == f'{SVG_NS}path' and not defs_depth:
+            name = elem.get(INKSCAPE_LABEL) or elem.get('id')
+            path_data = format_path(elem.get('d', ''))
+            if path_data:
+                yield name, transform_path(path_data, FONT_FLIP.transform(ctm))
+        elem.clear()
+
+
+def collect_svg_files(inputs):
+    svg_files = []
+    for item in inputs:
+        item = Path(item)
+        if item.is_dir():
+            svg_files.extend(sorted(item.rglob('*.svg')))
+        else:
+            svg_files.append(item)
+    return svg_files
+
+
+def import_svg_files(inputs, json_file='radicals.json', note=None):
+    """批量导入 SVG 文件/目录中的全部 <path>，一次性写回 JSON"""
+    print("\n" + "=" * 70)
+    print("🔤 中二病也要造汉字 - SVG 批量导入")
+    print("=" * 70)
+
+    if os.path.exists(json_file):
+        with open(json_file, 'r', encoding='utf-8') as f:
+            existing_data = json.load(f)
+        print(f"\n✓ 已加载 {len(existing_data)} 个现有部件")
+    else:
+        print(f"\n⚠️  {json_file} 不存在，将创建新文件")
+        existing_data = {}
+
+    found = []
+    for svg_file in collect_svg_files(inputs):
+        source_char = svg_file.stem.split('_')[0]
+        try:
+            for index, (name, path_data) in enumerate(iter_svg_paths(svg_file), 1):
+                component = {
+                    "source": f"{source_char}_manual",
+                    "path": path_data
+                }
+                if note:
+                    component["note"] = note
+                found.append((svg_file, index, name or f"{svg_file.stem}_{index}", component))
+        except ET.ParseError as e:
+            print(f"❌ 解析失败 {svg_file}: {e}")
+
+    # Inkscape 按文档编号 id（path1、path2…），多个文件之间同名很常见：
+    # 同批次内重名的部件加上文件名前缀，同一文件内仍重名的再加序号
+    counts = Counter(name for _, _, name, _ in found)
+    renamed = []
+    imported = {}
+    for svg_file, index, name, component in found:
+        unique_name = name
+        if counts[name] > 1:
+            unique_name = f"{svg_file.stem}_{name}"
+            if unique_name in imported:
+                unique_name = f"{unique_name}_{index}"
+            renamed.append(f"{name} → {unique_name}")
+        imported[unique_name] = component
+        print(f"✓ {svg_file.name} → {unique_name}（{len(component['path'])} 字符）")
+
+    if renamed:
+        print(f"\n⚠️  本批次有 {len(renamed)} 个重名部件，已加文件名前缀：")
+        for item in renamed:
+            print(f"   {item}")
+
+    if not imported:
+        print("\n❌ 未找到任何 path")
+        return {}
+
+    replaced = [name for name in imported if name in existing_data]
+    existing_data.update(imported)
+
+    with open(json_file, 'w', encoding='utf-8') as f:
+        json.dump(existing_data, f, ensure_ascii=False, indent=2)
+
+    print(f"\n✅ 已导入 {len(imported)} 个部件到 {json_file}")
+    if replaced:
+        print(f"⚠️  覆盖了 {len(replaced)} 个同名部件：{', '.join(replaced)}")
+    print(f"📁 文件：{Path(json_file).absolute()}")
+    return imported
+
+
 def add_radical_interactive(json_file='radicals.json'):
     print("\n" + "=" * 70)
     print("🔤 中二病也要造汉字 - 部件手动添加工具")
@@ -119,6 +279,12 @@ if __name__ == "__main__":
 
     parser = argparse.ArgumentParser(description='🔤 交互式部件添加工具')
     parser.add_argument('--json', default='radicals.json', help='JSON 文件路径')
+    parser.add_argument('--import', dest='import_paths', nargs='+', metavar='SVG',
+                        help='批量导入 SVG 文件或目录（部件名取 path 的 label/id）')
+    parser.add_argument('--note', help='批量导入时附加的 note 说明')
 
     args = parser.parse_args()
-    add_radical_interactive(args.json)
+    if args.import_paths:
+        import_svg_files(args.import_paths, args.json, args.note)
+    else:
+        add_radical_interactive(args.json)
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""中二病也要造汉字 - 轮廓合并
+
+把组合字中互相重叠的部件轮廓按非零环绕规则求并，得到一个没有重叠的
+单一轮廓，并去掉面积过小的碎片轮廓。依赖 skia-pathops：
+
+    pip install skia-pathops
+
+每个部件先单独 simplify 统一环绕方向（翻转过的部件方向是反的），
+再合并到一起整体 simplify，避免方向相反的轮廓互相抵消成空洞。
+"""
+
+import json
+
+from fontTools.pens.svgPathPen import SVGPathPen
+from fontTools.pens.transformPen import TransformPen
+from fontTools.svgLib.path import parse_path
+
+from radical_library import format_number
+
+try:
+    import pathops
+except ImportError:
+    pathops = None
+
+
+MIN_AREA = 4.0
+
+
+def _require_pathops():
+    if pathops is None:
+        raise ImportError("轮廓合并需要 skia-pathops，请先运行：pip install skia-pathops")
+
+
+def union_parts(drawers, clockwise=False, min_area=MIN_AREA):
+    """drawers 为若干 draw(pen) 可调用对象，返回合并后的 pathops.Path
+
+    clockwise=True 时外轮廓为顺时针（TrueType 约定），否则为逆时针（CFF 约定）。
+    """
+    _require_pathops()
+
+    combined = pathops.Path()
+    for draw in drawers:
+        part = pathops.Path()
+        draw(part.getPen())
+        try:
+            part = pathops.simplify(part, fix_winding=True)
+        except pathops.PathOpsError:
+            pass
+        part.draw(combined.getPen())
+
+    merged = pathops.simplify(combined, fix_winding=True, clockwise=clockwise)
+    if not min_area:
+        return merged
+
+    result = pathops.Path()
+    pen = result.getPen()
+    for contour in merged.contours:
+        if abs(contour.area) >= min_area:
+            contour.draw(pen)
+    return result
+
+
+def merge_paths(parts, clockwise=False, min_area=MIN_AREA):
+    """parts 为 (path 字符串, fontTools Transform 或 None)，返回合并后的 path 字符串"""
+    def drawer(path_data, transform):
+        def draw(pen):
+            parse_path(path_data, TransformPen(pen, transform) if transform else pen)
+        return draw
+
+    merged = union_parts([drawer(p, t) for p, t in parts], clockwise, min_area)
+    svg_pen = SVGPathPen(None, ntos=format_number)
+    merged.draw(svg_pen)
+    return svg_pen.getCommands()
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='🔤 中二病也要造汉字 - 部件轮廓合并')
+    parser.add_argument('json_file', help='部件库 JSON 文件路径')
+    parser.add_argument('components', nargs='*', help='要合并的部件名称（默认全部）')
+    parser.add_argument('--output', help='输出文件路径（默认覆盖原文件）')
+    parser.add_argument('--min-area', type=float, default=MIN_AREA, help='丢弃面积小于该值的轮廓')
+
+    args = parser.parse_args()
+
+    with open(args.json_file, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+
+    names = args.components or [name for name, entry in data.items() if entry.get('path')]
+    for name in names:
+        entry = data.get(name)
+        if not entry or not entry.get('path'):
+            print(f"⚠ {name} - 没有 path 数据")
+            continue
+        original = entry['path']
+        entry['path'] = merge_paths([(original, None)], min_area=args.min_area)
+        print(f"✓ {name}：{len(original)} → {len(entry['path'])} 字符")
+
+    output_file = args.output or args.json_file
+    with open(output_file, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+    print(f"✓ 已保存至：{output_file}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""中二病也要造汉字 - 部件库（支持引用型部件）
+
+radicals.json 中的部件有两种写法：
+
+1. 路径型：直接保存 path 字符串（原有格式）
+2. 引用型：只记录来源字体、字形、裁剪区域与变换，path 在使用时才生成
+
+    "白2": {
+      "source": "泊_right",
+      "ref": {
+        "font": "NotoSerifSC-VariableFont_wght.ttf",
+        "char": "泊",
+        "clip": [355, -100, 1000, 900],
+        "transform": [1, 0, 0, 1, 0, 0]
+      }
+    }
+
+裁剪按轮廓进行：控制点边界框中心落在 clip 内的轮廓会被保留。
+"""
+
+import json
+import os
+from functools import lru_cache
+from pathlib import Path
+
+from fontTools.misc.transform import Identity, Transform
+from fontTools.pens.boundsPen import ControlBoundsPen
+from fontTools.pens.recordingPen import RecordingPen
+from fontTools.pens.svgPathPen import SVGPathPen
+from fontTools.pens.transformPen import TransformPen
+from fontTools.ttLib import TTFont
+
+
+FONTS_DIR = Path(__file__).parent / 'fonts'
+DEFAULT_FONT = 'NotoSerifSC-VariableFont_wght.ttf'
+
+
+def format_number(value):
+    value = round(value, 3)
+    if value == int(value):
+        return str(int(value))
+    return f"{value:.3f}".rstrip('0')
+
+
+@lru_cache(maxsize=None)
+def _open_font(font_path):
+    font = TTFont(font_path)
+    return font.getGlyphSet(), font.getBestCmap()
+
+
+def _split_contours(recording):
+    contours = []
+    current = []
+    for op, args in recording:
+        if op == 'moveTo' and current:
+            contours.append(current)
+            current = []
+        current.append((op, args))
+        if op in ('closePath', 'endPath'):
+            contours.append(current)
+            current = []
+    if current:
+        contours.append(current)
+    return contours
+
+
+def _contour_in_clip(contour, clip):
+    pen = ControlBoundsPen(None)
+    for op, args in contour:
+        getattr(pen, op)(*args)
+    if pen.bounds is None:
+        return False
+    xMin, yMin, xMax, yMax = pen.bounds
+    cx, cy = (xMin + xMax) / 2, (yMin + yMax) / 2
+    return clip[0] <= cx <= clip[2] and clip[1] <= cy <= clip[3]
+
+
+@lru_cache(maxsize=4096)
+def materialize_reference(font_path, char=None, glyph=None, clip=None, transform=None):
+    """按引用生成 path 字符串，相同参数只计算一次
+
+    clip、transform 需要传入 tuple 以便缓存。
+    """
+    glyphSet, cmap = _open_font(str(font_path))
+    glyph_name = glyph or (cmap.get(ord(char)) if char else None)
+    if not glyph_name or glyph_name not in glyphSet:
+        return None
+
+    recording = RecordingPen()
+    glyphSet[glyph_name].draw(recording)
+
+    contours = _split_contours(recording.value)
+    if clip:
+        contours = [c for c in contours if _contour_in_clip(c, clip)]
+
+    svg_pen = SVGPathPen(None, ntos=format_number)
+    pen = TransformPen(svg_pen, Transform(*transform)) if transform else svg_pen
+    for contour in contours:
+        for op, args in contour:
+            getattr(pen, op)(*args)
+    return svg_pen.getCommands() or None
+
+
+class RadicalLibrary:
+    def __init__(self, json_file='radicals.json', fonts_dir=FONTS_DIR):
+        self.json_file = json_file
+        self.fonts_dir = Path(fonts_dir)
+
+        if os.path.exists(json_file):
+            with open(json_file, 'r', encoding='utf-8') as f:
+                self.data = json.load(f)
+        else:
+            self.data = {}
+
+    def __len__(self):
+        return len(self.data)
+
+    def __contains__(self, name):
+        return name in self.data
+
+    def names(self):
+        return list(self.data.keys())
+
+    def entry(self, name):
+        return self.data.get(name)
+
+    def _font_path(self, font):
+        font = font or DEFAULT_FONT
+        return font if os.path.isabs(font) else str(self.fonts_dir / font)
+
+    def get_path(self, name):
+        """返回部件的 path，引用型部件在首次访问时生成"""
+        entry = self.data.get(name)
+        if not entry:
+            return None
+        if entry.get('path'):
+            return entry['path']
+
+        ref = entry.get('ref')
+        if not ref:
+            return None
+
+        clip = ref.get('clip')
+        transform = ref.get('transform')
+        return materialize_reference(
+            self._font_path(ref.get('font')),
+            char=ref.get('char'),
+            glyph=ref.get('glyph'),
+            clip=tuple(clip) if clip else None,
+            transform=tuple(transform) if transform and tuple(transform) != tuple(Identity) else None
+        )
+
+    def materialize(self):
+        """返回所有部件都带 path 的副本，供前端等消费方使用"""
+        result = {}
+        for name, entry in self.data.items():
+            entry = dict(entry)
+            if not entry.get('path'):
+                path_data = self.get_path(name)
+                if not path_data:
+                    print(f"⚠ {name} - 引用无法解析")
+                    continue
+                entry['path'] = path_data
+            result[name] = entry
+        return result
+
+    def add_reference(self, name, char, clip=None, transform=None, font=DEFAULT_FONT,
+                      glyph=None, source=None, note=None):
+        ref = {"font": font, "char": char}
+        if glyph:
+            ref["glyph"] = glyph
+        if clip:
+            ref["clip"] = [round(v, 1) for v in clip]
+        if transform:
+            ref["transform"] = list(transform)
+
+        component = {"source": source or f"{char}_ref", "ref": ref}
+        if note:
+            component["note"] = note
+
+        self.data[name] = component
+        return component
+
+    def save(self, output_file=None):
+        output_file = output_file or self.json_file
+        with open(output_file, 'w', encoding='utf-8') as f:
+            json.dump(self.data, f, ensure_ascii=False, indent=2)
+        return output_file
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description='🔤 中二病也要造汉字 - 部件库工具',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+示例用法：
+  # 添加引用型部件（只保存字形 + 裁剪区域）
+  python radical_library.py add 白3 --char 泊 --clip 355 -100 1000 900
+
+  # 生成前端使用的完整部件库
+  python radical_library.py build --output radicals_built.json
+        """
+    )
+    parser.add_argument('--json', default='radicals.json', help='部件库 JSON 文件路径')
+    parser.add_argument('--fonts', default=str(FONTS_DIR), help='字体目录')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    add_parser = subparsers.add_parser('add', help='添加引用型部件')
+    add_parser.add_argument('name', help='部件名称')
+    add_parser.add_argument('--char', required=True, help='来源汉字')
+    add_parser.add_argument('--glyph', help='字形名（未编码字形时使用，如 uni2F69）')
+    add_parser.add_argument('--clip', type=float, nargs=4, metavar=('XMIN', 'YMIN', 'XMAX', 'YMAX'),
+                            help='裁剪区域（字体坐标）')
+    add_parser.add_argument('--transform', type=float, nargs=6, metavar='V',
+                            help='仿射变换 a b c d e f')
+    add_parser.add_argument('--font', default=DEFAULT_FONT, help='字体文件名')
+    add_parser.add_argument('--source', help='source 字段')
+    add_parser.add_argument('--note', help='note 说明')
+
+    build_parser = subparsers.add_parser('build', help='生成带完整 path 的部件库')
+    build_parser.add_argument('--output', default='radicals_built.json', help='输出文件路径')
+
+    args = parser.parse_args()
+    library = RadicalLibrary(args.json, args.fonts)
+
+    if args.command == 'add':
+        library.add_reference(
+            args.name, args.char,
+            clip=args.clip,
+            transform=args.transform,
+            font=args.font,
+            glyph=args.glyph,
+            source=args.source,
+            note=args.note
+        )
+        path_data = library.get_path(args.name)
+        if not path_data:
+            print(f"❌ 引用无法解析：{args.char}")
+            return
+        library.save()
+        print(f"✅ 已添加引用型部件 '{args.name}'（生成 path {len(path_data)} 字符）")
+    else:
+        data = library.materialize()
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+        print(f"✅ 已生成 {len(data)} 个部件 → {args.output}")
+
+
+if __name__ == "__main__":
+    main()